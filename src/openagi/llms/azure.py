@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Iterator
 from langchain_core.messages import HumanMessage
 from langchain_openai import AzureChatOpenAI  # Assuming this import is correct
 
@@ -52,6 +52,23 @@ class AzureChatOpenAIModel(LLMBaseModel):
         resp = self.llm([message])
         return resp.content
 
+    def stream(self, input_data: str) -> Iterator[str]:
+        """Streams the Azure Chat OpenAI model response for the provided input text.
+
+        Args:
+            input_data: The input text to process.
+
+        Yields:
+            Chunks of the response text as they are generated.
+        """
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        message = HumanMessage(content=input_data)
+        for chunk in self.llm.stream([message]):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> AzureChatConfigModel:
         """Loads the AzureChatOpenAI configurations from a YAML file.
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Any
+from typing import Any, Iterator
 
 from pydantic import BaseModel
 
@@ -44,6 +44,19 @@ class LLMBaseModel(BaseModel):
         """
         pass
 
+    def stream(self, input_data: Any) -> Iterator[str]:
+        """Streams the LLM response for the provided input in chunks.
+
+        LLMs that cannot stream yield the complete result of `run` as a single chunk.
+
+        Args:
+            input_data: The input to process by the LLM. The format can vary.
+
+        Yields:
+            Chunks of the response text as they are generated.
+        """
+        yield self.run(input_data)
+
     @staticmethod
     @abstractmethod
     def load_from_env_config():
@@ -1,6 +1,6 @@
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
 from openagi.utils.yamlParse import read_from_env
-from typing import Any
+from typing import Any, Iterator
 
 from langchain_core.messages import HumanMessage
 
@@ -51,6 +51,23 @@ class ChatAnthropicModel(LLMBaseModel):
         response = self.llm([message])
         return response.content
 
+    def stream(self, input_data: str) -> Iterator[str]:
+        """Streams the Chat Anthropic model response for the provided input text.
+
+        Args:
+            input_data: The input text to process.
+
+        Yields:
+            Chunks of the response text as they are generated.
+        """
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        message = HumanMessage(content=input_data)
+        for chunk in self.llm.stream([message]):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> ChatAnthropicConfigModel:
         """Loads the ChatAnthropic configurations from a env file.
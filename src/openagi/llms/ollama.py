@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Iterator
 from langchain_core.messages import HumanMessage
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
@@ -48,6 +48,23 @@ class OllamaModel(LLMBaseModel):
         resp = self.llm([message])
         return resp.content
 
+    def stream(self, input_data: str) -> Iterator[str]:
+        """Streams the Ollama model response for the provided input text.
+
+        Args:
+            input_data: The input text to process.
+
+        Yields:
+            Chunks of the response text as they are generated.
+        """
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        message = HumanMessage(content=input_data)
+        for chunk in self.llm.stream([message]):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> OllamaConfigModel:
         """Loads the Ollama configurations from a YAML file.
@@ -1,5 +1,5 @@
 import logging
-from typing import Any
+from typing import Any, Iterator
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 
@@ -48,6 +48,24 @@ class OpenAIModel(LLMBaseModel):
         resp = self.llm([message])
         return resp.content
 
+    def stream(self, input_text: str) -> Iterator[str]:
+        """Streams the OpenAI model response for the provided input text.
+
+        Args:
+            input_text: The input text to process.
+
+        Yields:
+            Chunks of the response text as they are generated.
+        """
+        logging.info(f"Streaming LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        message = HumanMessage(content=input_text)
+        for chunk in self.llm.stream([message]):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> OpenAIConfigModel:
         """Loads the OpenAI configurations from a YAML file.
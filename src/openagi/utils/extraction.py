@@ -8,6 +8,9 @@ from typing import Dict, List, Optional, Tuple
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel
 
+_JSON_BLOCK_RE = re.compile(r"```json(.*?)```", flags=re.DOTALL)
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
 
 def force_json_output(resp_txt: str, llm):
     """
@@ -48,11 +51,58 @@ def force_json_output(resp_txt: str, llm):
     return llm.run(prompt)
 
 
+def _last_json_block(text: str) -> Optional[str]:
+    """Returns the contents of the last ```json block in the text, or None if there is none."""
+    last_match = None
+    for last_match in _JSON_BLOCK_RE.finditer(text):
+        pass
+    if last_match is None:
+        return None
+    return last_match.group(1).strip().replace("\n", "")
+
+
+def _last_json_object(text: str) -> Optional[str]:
+    """
+    Returns the last balanced top-level {...} span in the text, or None if there is none.
+
+    Braces inside JSON strings are skipped. Only the structural characters are visited, so the
+    text is scanned once, in linear time, even for long LLM outputs.
+    """
+    last_span = None
+    depth = start = 0
+    in_string = False
+    skip = -1
+    for match in _JSON_TOKEN_RE.finditer(text):
+        pos = match.start()
+        if pos == skip:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0
+        elif char == "{":
+            if not depth:
+                start = pos
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if not depth:
+                last_span = (start, pos + 1)
+    if last_span is None:
+        return None
+    return text[last_span[0] : last_span[1]].replace("\n", "")
+
+
 def get_last_json(
     text: str, llm: Optional[LLMBaseModel] = None, max_iterations: int = 5
 ) -> Optional[Dict]:
     """
     Extracts the last block of text between ```json and ``` markers from a given string.
+    If there is no such block, the last bare JSON object in the string is used instead.
 
     Args:
         text (str): The string from which to extract the JSON block.
@@ -62,24 +112,29 @@ def get_last_json(
     Returns:
         dict or None: The last JSON block as a dictionary if found and parsed, otherwise None.
     """
-    pattern = r"```json(.*?)```"
-    matches = re.findall(pattern, text, flags=re.DOTALL)
-    if matches:
-        last_json = matches[-1].strip().replace("\n", "")
+    last_json = _last_json_block(text)
+    if last_json is not None:
         try:
             return json.loads(last_json)
         except json.JSONDecodeError:
             logging.error("JSON not extracted. Trying again.", exc_info=True)
             pass
 
+    # LLMs often skip the ```json fence, try the last bare JSON object before reformatting.
+    last_object = _last_json_object(text)
+    if last_object is not None:
+        try:
+            return json.loads(last_object)
+        except json.JSONDecodeError:
+            pass
+
     if llm:
         for iteration in range(1, max_iterations + 1):
             logging.info(f"Iteration {iteration} to extract JSON from LLM output.")
             try:
                 text = force_json_output(text, llm)
-                matches = re.findall(pattern, text, flags=re.DOTALL)
-                if matches:
-                    last_json = matches[-1].strip().replace("\n", "")
+                last_json = _last_json_block(text)
+                if last_json is not None:
                     json_resp = json.loads(last_json)
                     logging.info("JSON extracted successfully.")
                     return json_resp
@@ -1,20 +1,78 @@
+import asyncio
+import hashlib
+import io
+import json
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
-from textwrap import dedent
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from openagi.actions.utils import run_action
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel
 from openagi.memory.memory import Memory
+from openagi.prompts.summarizer import SummarizerPrompt
 from openagi.prompts.worker_task_execution import WorkerAgentTaskExecution
 from openagi.tasks.task import Task
 from openagi.utils.extraction import get_act_classes_from_json, get_last_json
 from openagi.utils.helper import get_default_id
 
+_OUTPUT_KEY_RE = re.compile(r"^[a-zA-Z_]+\Z")
+
+_GT20 = ">" * 20
+_LT20 = "<" * 20
+_STAR20 = "*" * 20
+_STAR20_B = _STAR20.encode()
+_NL_B = b"\n"
+
+_MAX_ACTION_THREADS = 8
+_FORCE_OUTPUT_ATTEMPTS = 2
+
+# In-process LRU of LLM responses, shared by all workers and backed by the
+# per-session JSON files written in `Worker._cached_run`, keyed by their path.
+_LLM_CACHE_SIZE = 256
+_llm_cache: "OrderedDict[str, str]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+
+def _log_bytes(fh, *parts: bytes) -> None:
+    """Writes the already encoded parts to the log file with a single call."""
+    fh.write(b"".join(parts))
+
+
+class _TaskHistory:
+    """The thoughts and observations of a task, with the offset at which each entry starts."""
+
+    def __init__(self, text: str = ""):
+        self._buf = io.StringIO()
+        self.entry_starts: List[int] = []
+        self.step_start = 0
+        if text:
+            self.add(text)
+
+    def add(self, entry: str) -> None:
+        self.entry_starts.append(self._buf.tell())
+        self._buf.write(entry)
+
+    def start_step(self) -> None:
+        """Marks where the entries of the current iteration begin."""
+        self.step_start = self._buf.tell()
+
+    def getvalue(self) -> str:
+        return self._buf.getvalue()
+
 
 class Worker(BaseModel):
     id: str = Field(default_factory=get_default_id)
@@ -26,7 +84,7 @@ class Worker(BaseModel):
         exclude=True,
     )
     memory: Optional[Memory] = Field(
-        default_factory=list,
+        default=None,
         description="Memory to be used.",
         exclude=True,
     )
@@ -46,60 +104,231 @@ class Worker(BaseModel):
         default=True,
         description="If set to True, the output will be overwritten even if it exists.",
     )
+    parallel_actions: bool = Field(
+        default=True,
+        description="If set to True, multiple actions returned in a single step are run concurrently. Disable for actions with shared side effects.",
+    )
+    max_history_chars: int = Field(
+        default=8000,
+        description="Once the thoughts and observations exceed this many characters, the older half is summarized to keep the prompt short. Set to 0 to disable.",
+    )
+    stream_llm_responses: bool = Field(
+        default=True,
+        description="If set to True, LLM responses are streamed and generation stops once the output is complete.",
+    )
+    cache_llm_responses: bool = Field(
+        default=True,
+        description="If set to True, LLM responses are cached per session by model and prompt, so an identical prompt within the same session replays the stored response instead of calling the LLM again.",
+    )
 
     # Validate output_key. Should contain only alphabets and only underscore are allowed. Not alphanumeric
     @field_validator("output_key")
     @classmethod
     def validate_output_key(cls, v, values, **kwargs):
-        if not re.match("^[a-zA-Z_]+$", v):
+        if not _OUTPUT_KEY_RE.match(v):
             raise ValueError(
                 f"Output key should contain only alphabets and only underscore are allowed. Got {v}"
             )
         return v
 
+    # The actions `_action_docs` and `_action_docs_json` were last built from, with their values.
+    _action_docs_cache: Optional[Tuple[tuple, List[Dict]]] = PrivateAttr(default=None)
+    _action_docs_json_cache: Optional[Tuple[tuple, str]] = PrivateAttr(default=None)
+
     class Config:
         arbitrary_types_allowed = True
 
+    @property
+    def _action_docs(self) -> List[Dict]:
+        """Docs of the supported actions, rebuilt only when the actions change."""
+        key = tuple(self.actions or ())
+        cached = self._action_docs_cache
+        if cached is None or cached[0] != key:
+            cached = (key, [action.cls_doc() for action in key])
+            self._action_docs_cache = cached
+        return cached[1]
+
+    @property
+    def _action_docs_json(self) -> str:
+        """`_action_docs` serialized as JSON, stored as the actions of executed tasks."""
+        key = tuple(self.actions or ())
+        cached = self._action_docs_json_cache
+        if cached is None or cached[0] != key:
+            if orjson:
+                docs_json = orjson.dumps(self._action_docs).decode()
+            else:
+                docs_json = json.dumps(self._action_docs, separators=(",", ":"), ensure_ascii=False)
+            cached = (key, docs_json)
+            self._action_docs_json_cache = cached
+        return cached[1]
+
     def worker_doc(self):
         """Returns a dictionary containing information about the worker, including its ID, role, description, and the supported actions."""
         return {
             "worker_id": self.id,
             "role": self.role,
             "description": self.instructions,
-            "supported_actions": [action.cls_doc() for action in self.actions],
+            "supported_actions": self._action_docs,
         }
 
+    def _run_llm(self, prompt: str) -> str:
+        """Runs the LLM, returning early once a streamed response already holds the output."""
+        if not self.stream_llm_responses:
+            return self.llm.run(prompt)
+
+        chunks = []
+        stream = self.llm.stream(prompt)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                # Only try to parse once a JSON object may have closed on a response mentioning the key.
+                if "}" not in chunk:
+                    continue
+                response = "".join(chunks)
+                if self.output_key not in response:
+                    continue
+                output = get_last_json(response)
+                if output and output.get(self.output_key):
+                    logging.debug("Output found in the streamed response, stopping generation.")
+                    return response
+        finally:
+            # Closing the generator cancels the upstream request when returning early.
+            stream.close()
+        return "".join(chunks)
+
+    def _llm_cache_key(self, prompt: str) -> str:
+        config = getattr(self.llm, "config", None)
+        model_id = f"{self.llm.__class__.__name__}:{getattr(config, 'model_name', '')}"
+        return hashlib.sha256(f"{model_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _cached_run(self, prompt: str) -> str:
+        """Runs the LLM with the prompt, reusing earlier responses to the same model and prompt."""
+        if not self.cache_llm_responses:
+            return self._run_llm(prompt)
+
+        key = self._llm_cache_key(prompt)
+        # Entries are scoped to the session, like the files backing them.
+        pth = Path(f"{self.memory.session_id}/llm_cache/{key}.json")
+        mem_key = str(pth)
+        with _llm_cache_lock:
+            response = _llm_cache.get(mem_key)
+            if response is not None:
+                _llm_cache.move_to_end(mem_key)
+        if response is not None:
+            logging.debug(f"LLM cache hit (memory) - {key}")
+            return response
+
+        if pth.exists():
+            try:
+                with open(pth, encoding="utf-8") as f:
+                    response = json.load(f)["response"]
+                logging.debug(f"LLM cache hit (disk) - {key}")
+            except (OSError, ValueError, KeyError):
+                logging.warning(f"Ignoring unreadable LLM cache entry - {pth}")
+
+        if response is None:
+            response = self._run_llm(prompt)
+            pth.parent.mkdir(parents=True, exist_ok=True)
+            tmp_pth = pth.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+            with open(tmp_pth, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "response": response}, f)
+            os.replace(tmp_pth, pth)
+
+        with _llm_cache_lock:
+            _llm_cache[mem_key] = response
+            if len(_llm_cache) > _LLM_CACHE_SIZE:
+                _llm_cache.popitem(last=False)
+        return response
+
+    def _compress_history(self, history: _TaskHistory) -> _TaskHistory:
+        """Replaces the older half of the history with a summary once it exceeds `max_history_chars`."""
+        text = history.getvalue()
+        if not self.max_history_chars or len(text) <= self.max_history_chars:
+            return history
+
+        # Cut at the first entry past the midpoint, but never inside the current iteration.
+        # When the current iteration holds most of the history, there is too little to summarize.
+        midpoint = len(text) // 2
+        cut = next(
+            (start for start in history.entry_starts if midpoint <= start <= history.step_start),
+            None,
+        )
+        if cut is None:
+            return history
+
+        logging.debug(f"Summarizing {cut} characters of the task history...")
+        summary = self._cached_run(
+            SummarizerPrompt.from_template({"past_messages": text[:cut], "instructions": ""})
+        )
+        compressed = _TaskHistory(f"Summary of the earlier iterations:\n{summary}\n\n")
+        compressed.start_step()
+        for start, end in zip(history.entry_starts, history.entry_starts[1:] + [len(text)]):
+            if start >= cut:
+                if start == history.step_start:
+                    compressed.start_step()
+                compressed.add(text[start:end])
+        return compressed
+
     def provoke_thought_obs(self, observation):
-        thoughts = dedent(f"""Observation: {observation}""".strip())
-        return thoughts
+        return f"Observation: {observation}"
 
     def should_continue(self, llm_resp: str) -> Union[bool, Optional[Dict]]:
         output: Dict = get_last_json(llm_resp, llm=self.llm, max_iterations=self.max_iterations)
         output_key_exists = bool(output and output.get(self.output_key))
         return (not output_key_exists, output)
 
-    def _force_output(
-        self, llm_resp: str, all_thoughts_and_obs: List[str]
-    ) -> Union[bool, Optional[str]]:
-        """Force the output once the max iterations are reached."""
+    def _force_output(self, history: str) -> Tuple[Dict, str]:
+        """Force the output once the max iterations are reached.
+
+        Returns the parsed output and the LLM response it was extracted from.
+        """
         prompt = (
-            "\n".join(all_thoughts_and_obs)
-            + "Based on the previous action and observation, give me the output."
+            history
+            + "Based on the previous action and observation, give me the output. "
+            + "Respond only with a JSON block in the following format:\n"
+            + f'```json\n{{"{self.output_key}": "<output>"}}\n```'
         )
-        output = self.llm.run(prompt)
-        cont, final_output = self.should_continue(output)
-        if cont:
-            prompt = (
-                "\n".join(all_thoughts_and_obs)
-                + f"Based on the previous action and observation, give me the output. {final_output}"
-            )
-            output = self.llm.run(prompt)
-            cont, final_output = self.should_continue(output)
-        if cont:
-            raise OpenAGIException(
-                f"LLM did not produce the expected output after {self.max_iterations} iterations."
+        feedback = ""
+        for attempt in range(_FORCE_OUTPUT_ATTEMPTS):
+            if attempt:
+                time.sleep(1.0 * attempt)
+            output = self._cached_run(prompt + feedback)
+            final_output = get_last_json(output)
+            if final_output and final_output.get(self.output_key):
+                return (final_output, output)
+            feedback = (
+                f"\nYour output had error: expected a JSON block with a non-empty "
+                f"`{self.output_key}` key, got {final_output}. Fix and retry."
             )
-        return (cont, final_output)
+        raise OpenAGIException(
+            f"LLM did not produce the expected output after {self.max_iterations} iterations."
+        )
+
+    def _run_action(self, act_cls, params: Dict) -> Tuple[Any, Optional[Exception]]:
+        """Runs a single action and returns its result, or the error it raised."""
+        # Copy the params instead of writing memory and llm into the parsed LLM response.
+        params = {**params, "memory": self.memory, "llm": self.llm}
+        try:
+            logging.debug(f"Running action: {act_cls.__name__}...")
+            res = run_action(action_cls=act_cls, **params)
+            logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
+            return res, None
+        except Exception as e:
+            logging.error(f"Error running action: {e}")
+            return None, e
+
+    def _run_actions(
+        self, actions: List[Tuple[Any, Dict]]
+    ) -> List[Tuple[Any, Optional[Exception]]]:
+        """Runs the actions, concurrently when `parallel_actions` is set, keeping their order."""
+        if not self.parallel_actions or len(actions) < 2:
+            return [self._run_action(act_cls, params) for act_cls, params in actions]
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_ACTION_THREADS, len(actions))) as executor:
+            futures = [
+                executor.submit(self._run_action, act_cls, params) for act_cls, params in actions
+            ]
+        return [future.result() for future in futures]
 
     def save_to_memory(self, task: Task):
         """Saves the output to the memory."""
@@ -108,19 +337,23 @@ class Worker(BaseModel):
     def execute_task(self, task: Task, context: Any = None) -> Any:
         """Executes the specified task."""
         logging.info(
-            f"{'>'*20} Executing Task - {task.name}[{task.id}] with worker - {self.role}[{self.id}] {'<'*20}"
+            f"{_GT20} Executing Task - {task.name}[{task.id}] with worker - {self.role}[{self.id}] {_LT20}"
         )
+        if not self.memory:
+            self.memory = Memory()
+        session_id = self.memory.session_id
+
         iteration = 1
         task_to_execute = f"{task.description}"
         worker_description = f"{self.role} - {self.instructions}"
-        all_thoughts_and_obs = []
+        history = _TaskHistory()
 
         logging.debug("Provoking initial thought observation...")
         initial_thought_provokes = self.provoke_thought_obs(None)
         te_vars = dict(
             task_to_execute=task_to_execute,
             worker_description=worker_description,
-            supported_actions=[action.cls_doc() for action in self.actions],
+            supported_actions=self._action_docs,
             thought_provokes=initial_thought_provokes,
             output_key=self.output_key,
             context=context,
@@ -129,114 +362,142 @@ class Worker(BaseModel):
 
         logging.debug("Generating base prompt...")
         base_prompt = WorkerAgentTaskExecution().from_template(te_vars)
-        prompt = f"{base_prompt}\nThought:\nIteration: {iteration}\nActions:\n"
+        initial_step = f"Thought:\nIteration: {iteration}\nActions:\n"
+        prompt = f"{base_prompt}\n{initial_step}"
 
         logging.debug("Running LLM with prompt...")
-        observations = self.llm.run(prompt)
+        observations = self._cached_run(prompt)
         logging.info(f"LLM execution completed. Observations: {observations}")
-        all_thoughts_and_obs.append(prompt)
-
-        max_iters = self.max_iterations + 1
-        while iteration < max_iters:
-            logging.info(f"---- Iteration {iteration} ----")
-            logging.debug("Checking if task should continue...")
-            continue_flag, output = self.should_continue(observations)
-
-            logging.debug("Extracting action from output...")
-            action = output.get("action") if output else None
-            if action:
-                action = [action]
-
-            # Save to memory
-            if output:
-                logging.debug("Saving task result and actions to memory...")
-                task.result = observations
-                task.actions = str([action.cls_doc() for action in self.actions])
-                self.save_to_memory(task=task)
+        # The history holds only what follows the base prompt, so every prompt of the task
+        # starts with the same prefix that the providers' prompt caching can reuse. Each prompt
+        # extends the previous one until `_compress_history` summarizes the older entries.
+        history.add(f"{initial_step}\n")
 
-            if not continue_flag:
-                logging.info(f"Task completed. Output: {output}")
-                break
+        # Keep a single buffered handle for the task log instead of reopening a file per iteration.
+        log_dir = Path(f"{session_id}/logs")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        pth = log_dir / f"{task.name}.log"
+        with open(pth, "ab", buffering=1 << 16) as log_fh:
+            max_iters = self.max_iterations + 1
+            continue_flag, output = True, None
+            while iteration < max_iters:
+                logging.info(f"---- Iteration {iteration} ----")
+                history.start_step()
+                logging.debug("Checking if task should continue...")
+                continue_flag, output = self.should_continue(observations)
 
-            if not action:
-                logging.warning(f"No action found in the output: {output}")
-                observations = f"Action: {action}\n{observations} Unable to extract action. Verify the output and try again."
-                all_thoughts_and_obs.append(observations)
-                iteration += 1
-                continue
-
-            if action:
-                action_json = f"```json\n{output}\n```\n"
-                try:
-                    logging.debug("Getting action classes from JSON...")
-                    actions = get_act_classes_from_json(action)
-                    logging.info(
-                        f"Extracted actions: {[act_cls.__name__ for act_cls, _ in actions]}"
-                    )
-                except KeyError as e:
-                    if "cls" in e or "module" in e or "kls" in e:
-                        observations = f"Action: {action_json}\n{observations}"
-                        all_thoughts_and_obs.append(action_json)
-                        all_thoughts_and_obs.append(observations)
-                        iteration += 1
-                        continue
-                    else:
-                        raise e
-
-                for act_cls, params in actions:
-                    params["memory"] = self.memory
-                    params["llm"] = self.llm
+                logging.debug("Extracting action from output...")
+                action = output.get("action") if output else None
+                if action and not isinstance(action, list):
+                    action = [action]
+
+                # Save to memory
+                if output:
+                    logging.debug("Saving task result and actions to memory...")
+                    task.result = observations
+                    task.actions = self._action_docs_json
+                    self.save_to_memory(task=task)
+
+                if not continue_flag:
+                    logging.info(f"Task completed. Output: {output}")
+                    break
+
+                if not action:
+                    logging.warning(f"No action found in the output: {output}")
+                    observations = f"Action: {action}\n{observations} Unable to extract action. Verify the output and try again."
+                    history.add(f"{observations}\n")
+                    iteration += 1
+                    continue
+
+                if action:
+                    action_json = f"```json\n{output}\n```\n"
                     try:
-                        logging.debug(f"Running action: {act_cls.__name__}...")
-                        res = run_action(action_cls=act_cls, **params)
-                        logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
-                    except Exception as e:
-                        logging.error(f"Error running action: {e}")
-                        observations = f"Action: {action_json}\n{observations}. {e} Try to fix the error and try again. Ignore if already tried more than twice"
-                        all_thoughts_and_obs.append(action_json)
-                        all_thoughts_and_obs.append(observations)
-                        iteration += 1
-                        continue
-
-                    observation_prompt = f"Observation: {res}\n"
-                    all_thoughts_and_obs.append(action_json)
-                    all_thoughts_and_obs.append(observation_prompt)
-                    observations = res
-
-                logging.debug("Provoking thought observation...")
-                thought_prompt = self.provoke_thought_obs(observations)
-                all_thoughts_and_obs.append(f"\n{thought_prompt}\nActions:\n")
-
-                prompt = f"{base_prompt}\n" + "\n".join(all_thoughts_and_obs)
-                logging.debug(f"\nSTART:{'*' * 20}\n{prompt}\n{'*' * 20}:END")
-                pth = Path(f"{self.memory.session_id}/logs/{task.name}-{iteration}.log")
-                pth.parent.mkdir(parents=True, exist_ok=True)
-                with open(pth, "w", encoding="utf-8") as f:
-                    f.write(f"{prompt}\n")
-                logging.debug("Running LLM with updated prompt...")
-                observations = self.llm.run(prompt)
-            iteration += 1
-        else:
-            if iteration == self.max_iterations:
-                logging.info("---- Forcing Output ----")
-                if self.force_output:
-                    logging.debug("Forcing output...")
-                    cont, final_output = self._force_output(observations, all_thoughts_and_obs)
-                    if cont:
-                        raise OpenAGIException(
-                            f"LLM did not produce the expected output after {iteration} iterations for task {task.name}"
+                        logging.debug("Getting action classes from JSON...")
+                        actions = get_act_classes_from_json(action)
+                        logging.info(
+                            f"Extracted actions: {[act_cls.__name__ for act_cls, _ in actions]}"
                         )
+                    except KeyError as e:
+                        if "cls" in e or "module" in e or "kls" in e:
+                            observations = f"Action: {action_json}\n{observations}"
+                            history.add(f"{action_json}\n{observations}\n")
+                            iteration += 1
+                            continue
+                        else:
+                            raise e
+
+                    for res, error in self._run_actions(actions):
+                        if error is not None:
+                            observations = f"Action: {action_json}\n{observations}. {error} Try to fix the error and try again. Ignore if already tried more than twice"
+                            history.add(f"{action_json}\n{observations}\n")
+                            iteration += 1
+                            continue
+
+                        observation_prompt = f"Observation: {res}\n"
+                        history.add(f"{action_json}\n{observation_prompt}\n")
+                        observations = res
+
+                    logging.debug("Provoking thought observation...")
+                    thought_prompt = self.provoke_thought_obs(observations)
+                    history.add(f"\n{thought_prompt}\nActions:\n\n")
+
+                    history = self._compress_history(history)
+                    prompt = f"{base_prompt}\n{history.getvalue()}"
+                    _log_bytes(
+                        log_fh,
+                        _STAR20_B,
+                        f" Iteration {iteration} ".encode(),
+                        _STAR20_B,
+                        _NL_B,
+                        prompt.encode("utf-8"),
+                        _NL_B,
+                    )
+                    logging.debug(f"Prompt for iteration {iteration} written to {pth}")
+                    logging.debug("Running LLM with updated prompt...")
+                    observations = self._cached_run(prompt)
+                iteration += 1
+            if continue_flag and iteration >= max_iters:
+                # The response to the last iteration's prompt has not been checked yet.
+                final_output = get_last_json(str(observations))
+                if final_output and final_output.get(self.output_key):
                     output = final_output
-                    logging.debug("Saving final task result and actions to memory...")
-                    task.result = observations
-                    task.actions = str([action.cls_doc() for action in self.actions])
-                    self.save_to_memory(task=task)
+                elif self.force_output:
+                    logging.info("---- Forcing Output ----")
+                    output, observations = self._force_output(
+                        f"{base_prompt}\n{history.getvalue()}"
+                    )
                 else:
                     raise OpenAGIException(
-                        f"LLM did not produce the expected output after {iteration} iterations for task {task.name}"
+                        f"LLM did not produce the expected output after {self.max_iterations} iterations for task {task.name}"
                     )
+                logging.debug("Saving final task result and actions to memory...")
+                task.result = observations
+                task.actions = self._action_docs_json
+                self.save_to_memory(task=task)
 
         logging.info(
             f"Task Execution Completed - {task.name} with worker - {self.role}[{self.id}] in {iteration} iterations"
         )
         return output, task
+
+
+class AsyncWorker(Worker):
+    """Worker with an awaitable `aexecute_task`, so several workers can run tasks concurrently.
+
+    The blocking LLM and action calls run in a thread, and an optional semaphore shared
+    between workers bounds how many tasks hit the LLM provider at the same time.
+    `execute_task` stays synchronous, so an AsyncWorker can still be assigned to an Admin.
+    """
+
+    semaphore: Optional[asyncio.Semaphore] = Field(
+        default=None,
+        description="Semaphore shared between workers to limit the number of concurrent task executions. Create it inside the running event loop, on Python 3.9 a semaphore created outside it is bound to another loop.",
+        exclude=True,
+    )
+
+    async def aexecute_task(self, task: Task, context: Any = None) -> Any:
+        """Executes the specified task without blocking the event loop."""
+        if not self.semaphore:
+            return await asyncio.to_thread(self.execute_task, task, context)
+        async with self.semaphore:
+            return await asyncio.to_thread(self.execute_task, task, context)